@@ -3,7 +3,8 @@ Application Settings
 Configuration management using Pydantic settings.
 """
 
-from pydantic_settings import BaseSettings
+from functools import lru_cache
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import Optional
 
 
@@ -21,19 +22,33 @@ class Settings(BaseSettings):
     # Server
     HOST: str = "0.0.0.0"
     PORT: int = 8000
+    THREADPOOL_SIZE: int = 100  # Max concurrent synchronous (`def`) handlers
+    # Single worker unless set; 0 means 2 * CPUs + 1. Each worker has its own
+    # in-memory data, so only raise this once storage is shared.
+    WORKERS: Optional[int] = None
 
     # Database (placeholder for future use)
     DATABASE_URL: Optional[str] = None
 
-    # TODO: Rate limiting configuration
-    # RATE_LIMIT_ENABLED: bool = True
-    # RATE_LIMIT_DEFAULT: str = "100/minute"
+    # Rate limiting (in-process token bucket per client IP)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_DEFAULT: str = "100/minute"
+    RATE_LIMIT_EXEMPT_PATHS: list[str] = ["/health"]  # e.g., load balancer probes
+    # TODO: Shared storage for multi-worker deployments
     # RATE_LIMIT_STORAGE_URL: Optional[str] = None  # e.g., "redis://localhost:6379"
 
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
+    model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Return the application settings, reading .env and the environment once.
+
+    Usable as a FastAPI dependency: `cfg: Settings = Depends(get_settings)`.
+    """
+    return Settings()
 
 
 # Global settings instance
-settings = Settings()
+settings = get_settings()
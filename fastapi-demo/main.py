@@ -4,29 +4,198 @@ A simple API demonstrating basic CRUD operations and project structure.
 This is a demo project for AI-assisted development demonstrations.
 """
 
-from fastapi import FastAPI, HTTPException, Depends
-from pydantic import BaseModel, EmailStr
-from typing import Optional
+from anyio.to_thread import current_default_thread_limiter
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Depends, Query, Request, Response
+from fastapi.openapi.docs import (
+    get_redoc_html,
+    get_swagger_ui_html,
+    get_swagger_ui_oauth2_redirect_html,
+)
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
+from itertools import count, islice
+from pydantic import BaseModel, ConfigDict, EmailStr, TypeAdapter
+from pydantic_core import to_json
+from typing import Iterable, Optional
+from dataclasses import dataclass, replace
 from datetime import datetime
+import gzip
+import hashlib
+import math
+import os
+import sys
+import threading
+import time
 
 from config.settings import settings
 
+# =============================================================================
+# Lifespan (startup/shutdown)
+# =============================================================================
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize resources on startup and clean them up on shutdown."""
+    print(f"Starting {settings.APP_NAME}...")
+    # Size the threadpool that runs the synchronous (`def`) endpoints
+    current_default_thread_limiter().total_tokens = settings.THREADPOOL_SIZE
+    if settings.DEBUG:
+        # Build and encode the OpenAPI schema now rather than on the first docs hit
+        _get_openapi_json()
+    # TODO: Initialize rate limiter storage (e.g., Redis connection) once and
+    # keep it on app.state so requests don't reconnect
+    # app.state.limiter_storage = await limiter.init()
+    yield
+    print(f"Shutting down {settings.APP_NAME}...")
+    # TODO: Close rate limiter connections
+    # await limiter.close()
+
+
 # Initialize FastAPI app
+# Every endpoint declares a response model so FastAPI serializes straight to
+# JSON bytes via Pydantic's core, skipping jsonable_encoder + json.dumps.
+# The built-in schema/docs routes are replaced below (see "API Docs").
 app = FastAPI(
     title=settings.APP_NAME,
     description="Demo API for AI-assisted development",
     version="0.1.0",
+    lifespan=lifespan,
+    openapi_url=None,
+    docs_url=None,
+    redoc_url=None,
 )
 
-# TODO: Add rate limiting middleware here
-# Example integration point for rate limiting:
-# from slowapi import Limiter, _rate_limit_exceeded_handler
-# from slowapi.util import get_remote_address
-# from slowapi.errors import RateLimitExceeded
-#
-# limiter = Limiter(key_func=get_remote_address)
-# app.state.limiter = limiter
-# app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+# =============================================================================
+# Compression
+# =============================================================================
+
+# JSON bodies (repeated keys, email domains, timestamps) compress very well.
+# Registered before the rate limiter: Starlette makes the last-added middleware
+# the outermost, so the limiter runs first and its 429s never reach GZip.
+_GZIP_MIN_SIZE = 500
+_GZIP_LEVEL = 5
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """Return whether an Accept-Encoding header allows gzip, honoring q-values."""
+    wildcard_ok = False
+    for item in accept_encoding.split(","):
+        coding, *params = (part.strip() for part in item.split(";"))
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        coding = coding.lower()
+        if coding == "gzip":
+            return quality > 0
+        if coding == "*":
+            wildcard_ok = quality > 0
+    return wildcard_ok
+
+
+class _GZipMiddleware(GZipMiddleware):
+    """GZipMiddleware that honors `q=0`; Starlette only does a substring check."""
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and not _accepts_gzip(Headers(scope=scope).get("accept-encoding", "")):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+app.add_middleware(_GZipMiddleware, minimum_size=_GZIP_MIN_SIZE, compresslevel=_GZIP_LEVEL)
+
+
+# =============================================================================
+# Rate limiting
+# =============================================================================
+
+# In-process token bucket per client IP. The middleware only runs on the event
+# loop thread, so the bucket dict needs no lock. With multiple workers each
+# process keeps its own buckets.
+# TODO: Use shared storage (e.g., Redis via RATE_LIMIT_STORAGE_URL) when
+# running more than one worker
+
+
+def _parse_rate_limit(limit: str) -> tuple[float, float]:
+    """Parse a "<amount>/<period>" limit into (bucket capacity, tokens per second)."""
+    amount, _, period = limit.partition("/")
+    seconds = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}[period.strip()]
+    capacity = float(amount)
+    return capacity, capacity / seconds
+
+
+_RATE_LIMIT_CAPACITY, _RATE_LIMIT_REFILL = _parse_rate_limit(settings.RATE_LIMIT_DEFAULT)
+
+# Client IP -> (tokens left, monotonic time of last update). Capped at
+# _MAX_BUCKETS entries so a flood of distinct IPs can't grow it without bound.
+# Entries are re-inserted on every request, so dict order is least- to
+# most-recently seen.
+_buckets: dict[str, tuple[float, float]] = {}
+_MAX_BUCKETS = 10_000
+
+
+def _sweep_buckets(now: float) -> None:
+    """Evict buckets that have refilled completely, then the least recently seen."""
+    for client_ip, (tokens, last_seen) in list(_buckets.items()):
+        if tokens + (now - last_seen) * _RATE_LIMIT_REFILL >= _RATE_LIMIT_CAPACITY:
+            del _buckets[client_ip]
+    # Leave headroom so the sweep doesn't rerun on every new client
+    target = _MAX_BUCKETS * 9 // 10
+    while len(_buckets) > target:
+        del _buckets[next(iter(_buckets))]
+
+
+class _RateLimitMiddleware:
+    """
+    Reject requests with 429 once a client has used up its token bucket.
+
+    Written as plain ASGI rather than `@app.middleware("http")`, whose
+    BaseHTTPMiddleware wrapper roughly doubles the cost of a cheap request.
+    Exempt paths are passed straight through before any other work.
+    """
+
+    def __init__(self, app: ASGIApp, exempt_paths: Iterable[str] = ()) -> None:
+        self.app = app
+        self.exempt_paths = frozenset(exempt_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths or not settings.RATE_LIMIT_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        client = scope.get("client")
+        client_ip = client[0] if client else "unknown"
+        now = time.monotonic()
+        if client_ip not in _buckets and len(_buckets) >= _MAX_BUCKETS:
+            _sweep_buckets(now)
+        # Pop and re-insert below so this client moves to the most-recent end
+        tokens, last_seen = _buckets.pop(client_ip, (_RATE_LIMIT_CAPACITY, now))
+        tokens = min(_RATE_LIMIT_CAPACITY, tokens + (now - last_seen) * _RATE_LIMIT_REFILL)
+
+        if tokens < 1:
+            _buckets[client_ip] = (tokens, now)
+            retry_after = math.ceil((1 - tokens) / _RATE_LIMIT_REFILL)
+            response = JSONResponse(
+                status_code=429,
+                content={"detail": "Rate limit exceeded"},
+                headers={"Retry-After": str(retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+
+        _buckets[client_ip] = (tokens - 1, now)
+        await self.app(scope, receive, send)
+
+
+app.add_middleware(_RateLimitMiddleware, exempt_paths=settings.RATE_LIMIT_EXEMPT_PATHS)
 
 
 # =============================================================================
@@ -51,74 +220,237 @@ class UserUpdate(BaseModel):
 
 
 class User(UserBase):
-    """Complete user model with all fields."""
+    """
+    Complete user model with all fields.
+
+    Instances are frozen snapshots of a stored row; build them with
+    `model_construct` from already-validated rows (see `_to_user`).
+    """
     id: int
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+
+class HealthResponse(BaseModel):
+    """Health check response."""
+    status: str
+    timestamp: datetime
+    version: str
+
+
+class RootResponse(BaseModel):
+    """API information returned by the root endpoint."""
+    message: str
+    docs_url: Optional[str]
+    health_url: str
 
 
 # =============================================================================
 # In-memory database (for demo purposes)
 # =============================================================================
 
+# Fixed seed timestamp so every worker process serves identical seed rows
+_SEED_CREATED_AT = datetime(2026, 1, 1)
+
+@dataclass(frozen=True, slots=True)
+class Row:
+    """
+    Stored user row.
+
+    A slotted dataclass is far denser than a dict or a Pydantic model (no
+    per-instance __dict__); `User` models are only built at the response edge.
+    Rows only ever hold validated input, and writes replace them.
+    """
+    id: int
+    name: str
+    email: str
+    created_at: datetime
+
+
+def _to_user(row: Row) -> User:
+    """Build the response model for a stored row, skipping re-validation."""
+    return User.model_construct(id=row.id, name=row.name, email=row.email, created_at=row.created_at)
+
+
 # Simple in-memory storage - replace with real database in production
-fake_db: dict[int, dict] = {
-    1: {"id": 1, "name": "Alice Johnson", "email": "alice@example.com", "created_at": datetime.now()},
-    2: {"id": 2, "name": "Bob Smith", "email": "bob@example.com", "created_at": datetime.now()},
+fake_db: dict[int, Row] = {
+    1: Row(1, "Alice Johnson", "alice@example.com", _SEED_CREATED_AT),
+    2: Row(2, "Bob Smith", "bob@example.com", _SEED_CREATED_AT),
 }
-next_id = 3
+
+# Atomic id allocator: `count.__next__` runs in C under the GIL, so concurrent
+# threadpool requests can't hand out the same id
+_next_id = count(max(fake_db) + 1).__next__
+
+# Write handlers run concurrently in the threadpool; this lock makes each
+# check-then-act on fake_db / email_index (and the cache invalidation) atomic
+_db_lock = threading.Lock()
+
+
+def _normalize_email(email: str) -> str:
+    """
+    Return the key used to detect duplicate emails, ignoring case.
+
+    Uses `lower()` rather than `casefold()`, which would also fold distinct
+    mailboxes together (e.g. "ß" -> "ss").
+    """
+    return email.lower()
+
+
+# Secondary index: normalized email -> user id, kept in sync on every write
+email_index: dict[str, int] = {_normalize_email(u.email): uid for uid, u in fake_db.items()}
+
+# Serialized body of the full user list, rebuilt lazily after any write.
+# The ETag is a hash of the body, so it stays correct across restarts and
+# across worker processes that each hold their own data.
+# The seed list is serialized at import so the first read is already warm.
+# A gzip-encoded copy is kept next to it so GZipMiddleware doesn't recompress
+# the same bytes on every request.
+_users_adapter = TypeAdapter(list[User])
+
+
+def _body_etag(body: bytes) -> str:
+    """Weak ETag derived from the response body."""
+    return f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weakly compare an If-None-Match header (a list or `*`) against `etag`."""
+    if not if_none_match:
+        return False
+    opaque = etag.removeprefix("W/")
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == opaque:
+            return True
+    return False
+
+
+_users_json_cache: Optional[bytes] = _users_adapter.dump_json([_to_user(row) for row in fake_db.values()])
+_users_etag: Optional[str] = _body_etag(_users_json_cache)
+_users_gzip_cache: Optional[bytes] = None
+
+
+def _invalidate_users_cache() -> None:
+    """Drop the cached user list after a write. Call with `_db_lock` held."""
+    global _users_json_cache, _users_etag, _users_gzip_cache
+    _users_json_cache = None
+    _users_etag = None
+    _users_gzip_cache = None
+
+
+# =============================================================================
+# Precomputed response bodies
+# =============================================================================
+
+# Constant part of the health payload; only the timestamp changes per request
+_HEALTH_BASE = {"status": "healthy", "version": app.version}
+
+# Health body cached for up to a second, so high-rate load balancer probes
+# don't each pay for a fresh clock read + datetime construction
+_HEALTH_TTL_SECONDS = 1.0
+_health_body: dict = {}
+_health_expires_at = 0.0
+
+
+def _current_health_body() -> dict:
+    """Return the health payload, refreshing its timestamp at most once per TTL."""
+    global _health_body, _health_expires_at
+    now = time.monotonic()
+    if now >= _health_expires_at:
+        _health_body = {**_HEALTH_BASE, "timestamp": datetime.now()}
+        _health_expires_at = now + _HEALTH_TTL_SECONDS
+    return _health_body
+
+# The root payload never changes, so serialize it once at import
+_ROOT_JSON = RootResponse(
+    message="Welcome to the FastAPI Demo",
+    docs_url="/docs" if settings.DEBUG else None,
+    health_url="/health",
+).model_dump_json().encode()
 
 
 # =============================================================================
 # Endpoints
 # =============================================================================
 
-@app.get("/health")
+@app.get("/health", response_model=HealthResponse)
 async def health_check():
     """
     Health check endpoint.
 
-    Returns the current status of the API.
-
-    TODO: Add rate limiting decorator here
-    # @limiter.limit("10/minute")
+    Returns the current status of the API. Exempt from rate limiting by
+    default (see RATE_LIMIT_EXEMPT_PATHS) so load balancer probes never get 429s.
     """
-    return {
-        "status": "healthy",
-        "timestamp": datetime.now().isoformat(),
-        "version": "0.1.0",
-    }
+    return _current_health_body()
 
 
-@app.get("/")
+@app.get("/", response_model=RootResponse)
 async def root():
     """Root endpoint with API information."""
-    return {
-        "message": "Welcome to the FastAPI Demo",
-        "docs_url": "/docs",
-        "health_url": "/health",
-    }
+    return Response(content=_ROOT_JSON, media_type="application/json")
 
 
 # -----------------------------------------------------------------------------
 # User CRUD Endpoints
 # -----------------------------------------------------------------------------
+# These handlers are purely synchronous, so they are declared with plain `def`
+# and FastAPI runs them in the AnyIO threadpool instead of on the event loop.
+# Reserve `async def` for handlers that await genuinely async I/O.
 
 @app.get("/users", response_model=list[User])
-async def list_users():
+def list_users(
+    request: Request,
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+):
     """
-    List all users.
+    List users, paginated with `limit` and `offset`.
+
+    A request covering the whole table is served from a cached, pre-serialized
+    body tagged with an ETag, so clients can revalidate with If-None-Match.
 
     TODO: Add rate limiting decorator here
     # @limiter.limit("30/minute")
     """
-    return [User(**user) for user in fake_db.values()]
+    global _users_json_cache, _users_etag, _users_gzip_cache
+
+    if offset or limit < len(fake_db):
+        return [_to_user(row) for row in islice(fake_db.values(), offset, offset + limit)]
+
+    # Fill the cache under the write lock so a concurrent write can't be
+    # overtaken by an older snapshot being stored after its invalidation
+    with _db_lock:
+        if _users_json_cache is None:
+            _users_json_cache = _users_adapter.dump_json([_to_user(row) for row in fake_db.values()])
+            _users_etag = _body_etag(_users_json_cache)
+        body, etag, gzip_body = _users_json_cache, _users_etag, _users_gzip_cache
+
+    # Weak ETag: the raw and gzip-encoded bodies share it
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "private, max-age=0",
+        "Vary": "Accept-Encoding",
+    }
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    if len(body) >= _GZIP_MIN_SIZE and _accepts_gzip(request.headers.get("accept-encoding", "")):
+        if gzip_body is None:
+            gzip_body = gzip.compress(body, compresslevel=_GZIP_LEVEL, mtime=0)
+            with _db_lock:
+                # Only keep it if no write replaced the body meanwhile
+                if _users_json_cache is body:
+                    _users_gzip_cache = gzip_body
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=gzip_body, media_type="application/json", headers=headers)
+
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @app.get("/users/{user_id}", response_model=User)
-async def get_user(user_id: int):
+def get_user(user_id: int):
     """
     Get a specific user by ID.
 
@@ -127,100 +459,173 @@ async def get_user(user_id: int):
     """
     if user_id not in fake_db:
         raise HTTPException(status_code=404, detail="User not found")
-    return User(**fake_db[user_id])
+    return _to_user(fake_db[user_id])
 
 
 @app.post("/users", response_model=User, status_code=201)
-async def create_user(user: UserCreate):
+def create_user(user: UserCreate):
     """
     Create a new user.
 
     TODO: Add rate limiting decorator here (stricter limit for writes)
     # @limiter.limit("10/minute")
     """
-    global next_id
+    email_key = _normalize_email(user.email)
 
-    # Check for duplicate email
-    for existing_user in fake_db.values():
-        if existing_user["email"] == user.email:
+    with _db_lock:
+        # Check for duplicate email
+        if email_key in email_index:
             raise HTTPException(status_code=400, detail="Email already registered")
 
-    new_user = {
-        "id": next_id,
-        "name": user.name,
-        "email": user.email,
-        "created_at": datetime.now(),
-    }
-    fake_db[next_id] = new_user
-    next_id += 1
+        new_id = _next_id()
+        new_row = Row(new_id, user.name, user.email, datetime.now())
+        fake_db[new_id] = new_row
+        email_index[email_key] = new_id
+        _invalidate_users_cache()
 
-    return User(**new_user)
+    return _to_user(new_row)
 
 
 @app.put("/users/{user_id}", response_model=User)
-async def update_user(user_id: int, user_update: UserUpdate):
+def update_user(user_id: int, user_update: UserUpdate):
     """
     Update an existing user.
 
     TODO: Add rate limiting decorator here
     # @limiter.limit("20/minute")
     """
-    if user_id not in fake_db:
-        raise HTTPException(status_code=404, detail="User not found")
+    # Only fields the client actually sent with a value; None means "leave as is"
+    patch = user_update.model_dump(exclude_none=True)
 
-    existing_user = fake_db[user_id]
+    with _db_lock:
+        if user_id not in fake_db:
+            raise HTTPException(status_code=404, detail="User not found")
 
-    if user_update.name is not None:
-        existing_user["name"] = user_update.name
-    if user_update.email is not None:
-        # Check for duplicate email
-        for uid, u in fake_db.items():
-            if uid != user_id and u["email"] == user_update.email:
+        existing_user = fake_db[user_id]
+
+        if "email" in patch:
+            # Check for duplicate email before touching the row
+            email_key = _normalize_email(patch["email"])
+            if email_index.get(email_key) not in (None, user_id):
                 raise HTTPException(status_code=400, detail="Email already registered")
-        existing_user["email"] = user_update.email
+            del email_index[_normalize_email(existing_user.email)]
+            email_index[email_key] = user_id
 
-    return User(**existing_user)
+        updated_row = replace(existing_user, **patch)
+        fake_db[user_id] = updated_row
+        _invalidate_users_cache()
+    return _to_user(updated_row)
 
 
 @app.delete("/users/{user_id}", status_code=204)
-async def delete_user(user_id: int):
+def delete_user(user_id: int):
     """
     Delete a user.
 
     TODO: Add rate limiting decorator here (stricter limit for destructive operations)
     # @limiter.limit("5/minute")
     """
-    if user_id not in fake_db:
-        raise HTTPException(status_code=404, detail="User not found")
+    with _db_lock:
+        if user_id not in fake_db:
+            raise HTTPException(status_code=404, detail="User not found")
 
-    del fake_db[user_id]
+        email_index.pop(_normalize_email(fake_db[user_id].email), None)
+        del fake_db[user_id]
+        _invalidate_users_cache()
     return None
 
 
 # =============================================================================
-# Startup/Shutdown Events
+# API Docs
 # =============================================================================
 
-@app.on_event("startup")
-async def startup_event():
-    """Initialize resources on startup."""
-    print(f"Starting {settings.APP_NAME}...")
-    # TODO: Initialize rate limiter storage (e.g., Redis connection)
-    # await limiter.init()
+# The OpenAPI schema only changes when the code does, so it is encoded to bytes
+# once instead of re-serialized on every /openapi.json request. Schema and docs
+# routes are only exposed in DEBUG; production has no docs routes at all.
+_OPENAPI_URL = "/openapi.json"
+_OAUTH2_REDIRECT_URL = "/docs/oauth2-redirect"
 
+# Encoded schema per ASGI root_path, since that changes the `servers` entry
+_openapi_json: dict[str, bytes] = {}
 
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Clean up resources on shutdown."""
-    print(f"Shutting down {settings.APP_NAME}...")
-    # TODO: Close rate limiter connections
-    # await limiter.close()
+
+def _get_openapi_json(root_path: str = "") -> bytes:
+    """
+    Return the encoded OpenAPI schema for `root_path`, building it on first use.
+
+    Mirrors FastAPI's built-in route: behind a path-prefixed proxy the prefix
+    is listed first in `servers` so "Try it out" requests hit the right URL.
+    """
+    cached = _openapi_json.get(root_path)
+    if cached is None:
+        schema = app.openapi()
+        if root_path and app.root_path_in_servers:
+            servers = schema.get("servers", [])
+            if root_path not in {server.get("url") for server in servers}:
+                schema = {**schema, "servers": [{"url": root_path}, *servers]}
+        cached = _openapi_json[root_path] = to_json(schema)
+    return cached
+
+
+if settings.DEBUG:
+    @app.get(_OPENAPI_URL, include_in_schema=False)
+    async def openapi_schema(request: Request):
+        """Serve the precomputed OpenAPI schema."""
+        root_path = request.scope.get("root_path", "").rstrip("/")
+        return Response(content=_get_openapi_json(root_path), media_type="application/json")
+
+    @app.get("/docs", include_in_schema=False)
+    async def swagger_ui(request: Request):
+        """Swagger UI for the API."""
+        root_path = request.scope.get("root_path", "").rstrip("/")
+        return get_swagger_ui_html(
+            openapi_url=root_path + _OPENAPI_URL,
+            title=f"{app.title} - Swagger UI",
+            oauth2_redirect_url=root_path + _OAUTH2_REDIRECT_URL,
+        )
+
+    @app.get(_OAUTH2_REDIRECT_URL, include_in_schema=False)
+    async def swagger_ui_redirect():
+        """OAuth2 redirect target for Swagger UI."""
+        return get_swagger_ui_oauth2_redirect_html()
+
+    @app.get("/redoc", include_in_schema=False)
+    async def redoc(request: Request):
+        """ReDoc documentation for the API."""
+        root_path = request.scope.get("root_path", "").rstrip("/")
+        return get_redoc_html(openapi_url=root_path + _OPENAPI_URL, title=f"{app.title} - ReDoc")
 
 
 # =============================================================================
 # Main Entry Point
 # =============================================================================
 
+def _worker_count() -> int:
+    """
+    Number of uvicorn worker processes to run.
+
+    Defaults to a single worker: each process keeps its own in-memory users,
+    email index, id counter and rate-limit buckets, so multiple workers would
+    serve inconsistent data until shared storage exists. Set WORKERS to opt in,
+    or WORKERS=0 for 2 * usable CPUs + 1 (counted via the scheduler affinity
+    mask so container limits are respected). DEBUG always runs one worker,
+    since reload and multiple workers are mutually exclusive.
+    """
+    if settings.DEBUG or settings.WORKERS is None:
+        return 1
+    if settings.WORKERS > 0:
+        return settings.WORKERS
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # Not available on macOS/Windows
+        cpus = os.cpu_count() or 1
+    return 2 * cpus + 1
+
+
+# Platforms where uvicorn[standard] installs uvloop
+_UVLOOP_SUPPORTED = sys.platform != "win32" and sys.implementation.name == "cpython"
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
@@ -228,4 +633,13 @@ if __name__ == "__main__":
         host=settings.HOST,
         port=settings.PORT,
         reload=settings.DEBUG,
+        workers=_worker_count(),
+        # C-backed event loop and HTTP parser. "auto" already prefers them when
+        # installed; pinning makes a broken install fail at startup instead of
+        # running on asyncio/h11. uvicorn[standard] only installs uvloop on
+        # CPython outside Windows, so keep "auto" for the loop elsewhere.
+        loop="uvloop" if _UVLOOP_SUPPORTED else "auto",
+        http="httptools",
+        # Per-request access logging is only worth its cost while developing
+        access_log=settings.DEBUG,
     )
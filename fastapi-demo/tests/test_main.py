@@ -3,7 +3,10 @@ Tests for the FastAPI Demo application.
 """
 
 import pytest
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import HTTPException, Request
 from httpx import AsyncClient, ASGITransport
+import main
 from main import app
 
 
@@ -12,6 +15,12 @@ def anyio_backend():
     return "asyncio"
 
 
+@pytest.fixture(autouse=True)
+def fresh_rate_limit_buckets(monkeypatch):
+    """Give every test its own rate-limit state so the suite never drains a bucket."""
+    monkeypatch.setattr(main, "_buckets", {})
+
+
 @pytest.fixture
 async def client():
     """Create an async test client."""
@@ -45,6 +54,29 @@ async def test_root_endpoint(client):
     assert "docs_url" in data
 
 
+@pytest.mark.anyio
+async def test_openapi_schema(client):
+    """Test the OpenAPI schema and docs are served in DEBUG mode."""
+    response = await client.get("/openapi.json")
+    assert response.status_code == 200
+    assert "/users" in response.json()["paths"]
+
+    response = await client.get("/docs")
+    assert response.status_code == 200
+
+
+@pytest.mark.anyio
+async def test_openapi_behind_root_path():
+    """Test that docs and schema honor the ASGI root_path of a prefixed proxy."""
+    transport = ASGITransport(app=app, root_path="/api")
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.get("/api/docs")
+        assert "/api/openapi.json" in response.text
+
+        response = await ac.get("/api/openapi.json")
+        assert response.json()["servers"][0] == {"url": "/api"}
+
+
 # =============================================================================
 # User CRUD Tests
 # =============================================================================
@@ -59,6 +91,57 @@ async def test_list_users(client):
     assert len(data) >= 2  # We have 2 seed users
 
 
+@pytest.mark.anyio
+async def test_list_users_pagination(client):
+    """Test that limit and offset select a page of users."""
+    response = await client.get("/users", params={"limit": 1, "offset": 1})
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data) == 1
+    assert data[0]["id"] == 2
+
+
+@pytest.mark.anyio
+async def test_list_users_etag(client):
+    """Test that the full user list can be revalidated with its ETag."""
+    response = await client.get("/users")
+    etag = response.headers["etag"]
+
+    response = await client.get("/users", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+    # Lists of tags and the wildcard also match
+    response = await client.get("/users", headers={"If-None-Match": f'"other", {etag}'})
+    assert response.status_code == 304
+    response = await client.get("/users", headers={"If-None-Match": "*"})
+    assert response.status_code == 304
+
+    # Any write invalidates the cached list and its ETag
+    await client.post("/users", json={"name": "ETag User", "email": "etag@example.com"})
+    response = await client.get("/users", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+@pytest.mark.anyio
+async def test_list_users_gzip(client):
+    """Test that a large enough user list is served gzip-encoded."""
+    for i in range(10):
+        await client.post("/users", json={"name": f"Gzip User {i}", "email": f"gzip{i}@example.com"})
+
+    response = await client.get("/users", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert len(response.json()) >= 12
+
+    response = await client.get("/users", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert len(response.json()) >= 12
+
+    response = await client.get("/users", headers={"Accept-Encoding": "gzip;q=0, identity"})
+    assert "content-encoding" not in response.headers
+
+
 @pytest.mark.anyio
 async def test_get_user(client):
     """Test getting a specific user."""
@@ -113,6 +196,56 @@ async def test_create_user_duplicate_email(client):
     assert response.status_code == 400
 
 
+@pytest.mark.anyio
+async def test_create_user_duplicate_email_case_insensitive(client):
+    """Test that emails differing only in case are treated as duplicates."""
+    response = await client.post("/users", json={"name": "Case User", "email": "casing@example.com"})
+    assert response.status_code == 201
+
+    response = await client.post("/users", json={"name": "Case User 2", "email": "Casing@Example.com"})
+    assert response.status_code == 400
+
+
+@pytest.mark.anyio
+async def test_create_user_distinct_non_ascii_emails(client):
+    """Test that emails equal only under Unicode case folding are distinct."""
+    response = await client.post("/users", json={"name": "Strasse 1", "email": "Straße@example.com"})
+    assert response.status_code == 201
+
+    response = await client.post("/users", json={"name": "Strasse 2", "email": "strasse@example.com"})
+    assert response.status_code == 201
+
+
+@pytest.mark.anyio
+async def test_create_user_invalid_email(client):
+    """Test creating a user with a malformed email fails validation."""
+    response = await client.post("/users", json={"name": "Bad Email", "email": "not-an-email"})
+    assert response.status_code == 422
+
+
+@pytest.mark.anyio
+async def test_create_user_email_forms(client):
+    """Test that surrounding whitespace and display names are accepted."""
+    response = await client.post("/users", json={"name": "Spaced", "email": " spaced@example.com "})
+    assert response.status_code == 201
+    assert response.json()["email"] == "spaced@example.com"
+
+    response = await client.post("/users", json={"name": "Named", "email": "Named <named@example.com>"})
+    assert response.status_code == 201
+    assert response.json()["email"] == "named@example.com"
+
+
+@pytest.mark.anyio
+async def test_update_user_duplicate_email(client):
+    """Test updating a user to another user's email fails."""
+    response = await client.put("/users/2", json={"name": "Renamed Bob", "email": "alice@example.com"})
+    assert response.status_code == 400
+
+    # A rejected update leaves the user unchanged
+    response = await client.get("/users/2")
+    assert response.json()["name"] == "Bob Smith"
+
+
 @pytest.mark.anyio
 async def test_update_user(client):
     """Test updating an existing user."""
@@ -143,20 +276,106 @@ async def test_delete_user(client):
     assert get_response.status_code == 404
 
 
+def _call_status(func, *args):
+    """Call an endpoint function directly, returning its HTTP status code."""
+    try:
+        func(*args)
+    except HTTPException as e:
+        return e.status_code
+    return 200
+
+
+def test_concurrent_writes_are_atomic():
+    """Test that concurrent creates/deletes from the threadpool don't race."""
+    user = main.UserCreate(name="Racer", email="racer@example.com")
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        statuses = list(pool.map(lambda _: _call_status(main.create_user, user), range(32)))
+    assert statuses.count(200) == 1
+    assert statuses.count(400) == 31
+
+    user_id = main.email_index["racer@example.com"]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        statuses = list(pool.map(lambda _: _call_status(main.delete_user, user_id), range(32)))
+    assert statuses.count(200) == 1
+    assert statuses.count(404) == 31
+    assert "racer@example.com" not in main.email_index
+
+
+def test_list_users_cache_not_stale_under_concurrent_writes():
+    """Test that a list built during a write is never cached after it."""
+    def write(i):
+        user = main.create_user(main.UserCreate(name="Cache Racer", email=f"cacheracer{i}@example.com"))
+        main.delete_user(user.id)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        for i in range(50):
+            pool.submit(write, i)
+            pool.submit(main.list_users, Request({"type": "http", "headers": []}), 1000, 0)
+
+    response = main.list_users(Request({"type": "http", "headers": []}), 1000, 0)
+    assert response.body == main._users_adapter.dump_json([main._to_user(row) for row in main.fake_db.values()])
+
+
 # =============================================================================
-# TODO: Rate Limiting Tests
+# Rate Limiting Tests
 # =============================================================================
 
-# @pytest.mark.anyio
-# async def test_rate_limiting(client):
-#     """Test that rate limiting is enforced."""
-#     # Make requests until rate limit is hit
-#     for i in range(15):
-#         response = await client.get("/health")
-#         if response.status_code == 429:
-#             # Rate limit hit as expected
-#             assert "Retry-After" in response.headers
-#             return
-#
-#     # If we get here, rate limiting might not be enabled
-#     pytest.skip("Rate limiting not enabled or limit not reached")
+@pytest.mark.anyio
+async def test_rate_limiting(client, monkeypatch):
+    """Test that rate limiting is enforced."""
+    monkeypatch.setattr(main, "_buckets", {})
+    monkeypatch.setattr(main, "_RATE_LIMIT_CAPACITY", 10.0)
+    monkeypatch.setattr(main, "_RATE_LIMIT_REFILL", 10 / 60)
+
+    # Make requests until rate limit is hit
+    for i in range(15):
+        response = await client.get("/")
+        if response.status_code == 429:
+            # Rate limit hit as expected, after the bucket was drained
+            assert i == 10
+            assert "Retry-After" in response.headers
+            return
+
+    pytest.fail("Rate limit was not enforced")
+
+
+@pytest.mark.anyio
+async def test_rate_limiting_exempts_health(client, monkeypatch):
+    """Test that health probes are never rate limited."""
+    monkeypatch.setattr(main, "_buckets", {})
+    monkeypatch.setattr(main, "_RATE_LIMIT_CAPACITY", 1.0)
+
+    for _ in range(5):
+        response = await client.get("/health")
+        assert response.status_code == 200
+
+
+def test_rate_limit_buckets_are_bounded(monkeypatch):
+    """Test that idle buckets are swept and the table stays under its cap."""
+    now = main.time.monotonic()
+    buckets = {f"10.0.0.{i}": (0.0, now) for i in range(10)}
+    buckets["10.0.1.1"] = (0.0, now - 3600)  # Long idle, so fully refilled
+    monkeypatch.setattr(main, "_buckets", buckets)
+    monkeypatch.setattr(main, "_MAX_BUCKETS", 10)
+
+    main._sweep_buckets(now)
+    assert "10.0.1.1" not in buckets
+    assert len(buckets) <= 9
+
+
+@pytest.mark.anyio
+async def test_rate_limit_evicts_least_recently_seen(client, monkeypatch):
+    """Test that a client seen recently outlives older buckets on eviction."""
+    now = main.time.monotonic()
+    # The test client's bucket is the oldest entry and is drained
+    buckets = {"127.0.0.1": (0.0, now)}
+    buckets.update({f"10.0.0.{i}": (0.0, now) for i in range(9)})
+    monkeypatch.setattr(main, "_buckets", buckets)
+    monkeypatch.setattr(main, "_MAX_BUCKETS", 10)
+
+    response = await client.get("/")
+    assert response.status_code == 429
+
+    main._sweep_buckets(now)
+    assert "127.0.0.1" in buckets
+    assert buckets["127.0.0.1"][0] < 1